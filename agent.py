@@ -3,6 +3,9 @@ from lux.game import Game
 from lux.game_map import Cell, RESOURCE_TYPES
 from lux.constants import Constants
 from lux.game_constants import GAME_CONSTANTS
+from lux.resource_clusters import ResourceClusters
+from lux.resource_forecast import ResourceForecast
+from lux.action_masks import ActionMasks
 from lux import annotate
 import math
 import sys
@@ -22,9 +25,12 @@ def find_resources(game_state):
     return resource_tiles
 
 # the next snippet finds the closest resources that we can mine given position on a map
-def find_closest_resources(pos, player, resource_tiles):
+# if the fuel a worker would harvest from each tile is given, the tile with the most fuel per turn of travel wins
+def find_closest_resources(pos, player, resource_tiles, harvest=None):
     closest_dist = math.inf
     closest_resource_tile = None
+    best_score = 0
+    best_resource_tile = None
     for resource_tile in resource_tiles:
         # we skip over resources that we can't mine due to not having researched them
 
@@ -38,6 +44,18 @@ def find_closest_resources(pos, player, resource_tiles):
         if dist < closest_dist:
             closest_dist = dist
             closest_resource_tile = resource_tile
+
+        if harvest is not None:
+            # next to a tile the worker is already one of its harvesters, elsewhere it would join them
+            mining, joining = harvest
+            fuel = (mining if dist <= 1 else joining)[resource_tile.pos.y, resource_tile.pos.x]
+            score = fuel / (dist + 1)
+            if score > best_score:
+                best_score = score
+                best_resource_tile = resource_tile
+
+    if best_resource_tile is not None:
+        return best_resource_tile
     return closest_resource_tile
 
 def find_closest_city_tile(pos, player):
@@ -60,7 +78,7 @@ def random_free(unit, targets,game_state):
     
     for direc in dirs:
         new_target = unit.pos.translate(direc, 1)
-        if (new_target not in targets) and (new_target.x < game_state.map_width) and (new_target.y < game_state.map_height):
+        if (new_target not in targets) and action_masks.unit_can(unit, direc):
             targets.append(new_target)
             return new_target, unit.move(direc)
     
@@ -134,8 +152,14 @@ def near(unit, targets, dist):
     
 
 game_state = None
+clusters = None
+action_masks = None
+# debug overlay, only filled when the environment runs with annotations on
+# the configuration's annotation_level (default ANNOTATION_LEVEL) picks how much is drawn
+ANNOTATION_LEVEL = annotate.DEBUG
+annotations = annotate.AnnotationBuffer()
 def agent(observation, configuration):
-    global game_state
+    global game_state, clusters, action_masks
 
     ### Do not edit ###
     if observation["step"] == 0:
@@ -145,15 +169,28 @@ def agent(observation, configuration):
         game_state.id = observation.player
     else:
         game_state._update(observation["updates"])
+
+    if observation["step"] == 0:
+        clusters = ResourceClusters(game_state)
+    else:
+        clusters.update(game_state)
     
     actions = []
 
+    if configuration is not None and configuration.get("annotations"):
+        annotations.level = configuration.get("annotation_level", ANNOTATION_LEVEL)
+    else:
+        annotations.level = annotate.OFF
+
     ### AI Code goes down here! ### 
     player = game_state.players[observation.player]
     opponent = game_state.players[(observation.player + 1) % 2]
     width, height = game_state.map.width, game_state.map.height
 
     resource_tiles = find_resources(game_state)
+
+    # legal actions of our units and city tiles this turn
+    action_masks = ActionMasks(game_state, observation.player)
     
     # Fuel only gets used up at night so we need enough to last the nights
     
@@ -172,6 +209,11 @@ def agent(observation, configuration):
     
     #Copy resource tiles 
     resource_tiles_copy=resource_tiles.copy()
+
+    #Forecast the fuel a worker harvests from each tile by nightfall (or daybreak at night) while our workers keep mining
+    horizon= turns_to_night if turns_to_night > 0 else 40 - turn%40
+    forecast= ResourceForecast(game_state.map, [unit.pos for unit in player.units if unit.is_worker()], player)
+    harvest= (forecast.harvester_yield(horizon), forecast.harvester_yield(horizon, extra_harvesters=1))
     
     #Keep a list of target locations
     prev_loc=[unit.pos for unit in player.units]
@@ -222,7 +264,7 @@ def agent(observation, configuration):
             if tile.can_act():
                 
                 # If we have fewer units than cities create a unit
-                if len(player.units) < sum([len(city.citytiles) for city in player.cities.values()]):
+                if action_masks.citytile_can(tile, 'bw'):
                     action = tile.build_worker()
                     actions.append(action)
                 
@@ -240,6 +282,8 @@ def agent(observation, configuration):
     
     if total_req_fuel < total_city_fuel:
         new_city==False
+
+    annotations.sidetext("turn {} fuel {:.0f} / {:.0f}", turn, total_city_fuel, total_req_fuel, level=annotate.DEBUG)
     
     for count, unit in enumerate(player.units):
         # if the unit is a worker (can mine resources) and can perform an action this turn
@@ -311,20 +355,29 @@ def agent(observation, configuration):
             # Prepare to cross long distances
             elif (12< turn < 40) and unit.get_cargo_space_left() < 40 and count > 2:
 
-                dist= 0
-                while dist < 8:
+                # head for a cluster well away from home
+                home= closest_city_tile.pos if closest_city_tile is not None else unit.pos
 
-                    closest_resource_tile = find_closest_resources(tile.pos, player, resource_tiles_copy)
+                cluster= clusters.expansion_target(home, player, min_dist=8)
 
-                    dist= closest_resource_tile.pos.distance_to(tile.pos)
+                # nothing to gain there before nightfall
+                if cluster is not None and ResourceForecast.cluster_total(harvest[1], cluster) <= 0:
+                    cluster= None
 
-                    i= resource_tiles_copy.index(closest_resource_tile)
+                if cluster is None:
+                    action = unit.move('c')
+                    actions.append(action)
 
-                    del resource_tiles_copy[i]
+                    targets.append(unit.pos)
+                    continue
 
-                action = unit.move(unit.pos.direction_to(closest_resource_tile.pos))
+                target_pos= clusters.claim(cluster, unit.pos, player.team)
+
+                annotations.line(unit.pos.x, unit.pos.y, target_pos.x, target_pos.y)
+
+                action = unit.move(unit.pos.direction_to(target_pos))
                     
-                direction= unit.pos.direction_to(closest_resource_tile.pos)
+                direction= unit.pos.direction_to(target_pos)
 
                 target= unit.pos.translate(direction,1)
                 
@@ -362,11 +415,13 @@ def agent(observation, configuration):
             elif unit.get_cargo_space_left() > 0:
                 # find the closest resource if it exists to this unit
                 
-                closest_resource_tile = find_closest_resources(unit.pos, player, resource_tiles_copy)
+                closest_resource_tile = find_closest_resources(unit.pos, player, resource_tiles_copy, harvest)
                 
                 if closest_resource_tile is not None:
                     
                     i= resource_tiles_copy.index(closest_resource_tile)
+
+                    annotations.circle(closest_resource_tile.pos.x, closest_resource_tile.pos.y, level=annotate.TRACE)
                     
                     # create a move action to move this unit in the direction of the closest resource tile and add to our actions list
                     action = unit.move(unit.pos.direction_to(closest_resource_tile.pos))
@@ -412,5 +467,7 @@ def agent(observation, configuration):
                     target= unit.pos.translate(direction,1)
                 
                     targets, actions= collision_avoider(targets, target, actions, action, unit, city_tiles)
+
+    actions.extend(annotations.flush())
                     
     return actions
@@ -0,0 +1,107 @@
+import numpy as np
+
+from .constants import Constants
+from .game_constants import GAME_CONSTANTS
+
+DIRECTIONS = Constants.DIRECTIONS
+PARAMETERS = GAME_CONSTANTS["PARAMETERS"]
+
+# columns of ActionMasks.units, moves use the direction letters of Unit.move
+UNIT_ACTIONS = (
+    DIRECTIONS.CENTER,
+    DIRECTIONS.NORTH,
+    DIRECTIONS.EAST,
+    DIRECTIONS.SOUTH,
+    DIRECTIONS.WEST,
+    "bcity",
+    "p",
+)
+# columns of ActionMasks.citytiles, research / build worker / build cart
+CITYTILE_ACTIONS = ("r", "bw", "bc")
+
+UNIT_ACTION = {action: i for i, action in enumerate(UNIT_ACTIONS)}
+CITYTILE_ACTION = {action: i for i, action in enumerate(CITYTILE_ACTIONS)}
+
+MOVES = [
+    (DIRECTIONS.NORTH, 0, -1),
+    (DIRECTIONS.EAST, 1, 0),
+    (DIRECTIONS.SOUTH, 0, 1),
+    (DIRECTIONS.WEST, -1, 0),
+]
+
+
+class ActionMasks:
+    """
+    Legal actions of every unit and city tile of a team for the current turn, computed in one
+    pass over the map. units[i, UNIT_ACTION[a]] / citytiles[i, CITYTILE_ACTION[a]] is True if the
+    action is legal. A move is illegal off the map, into an opponent city tile or into a tile
+    already occupied by a unit outside our own cities; moves other units make this turn are not
+    taken into account.
+    """
+    def __init__(self, game, team):
+        game_map = game.map
+        player = game.players[team]
+        shape = (game_map.height, game_map.width)
+
+        own_citytile = np.zeros(shape, dtype=bool)
+        any_citytile = np.zeros(shape, dtype=bool)
+        has_resource = np.zeros(shape, dtype=bool)
+        road = np.zeros(shape)
+        for row in game_map.map:
+            for cell in row:
+                y, x = cell.pos.y, cell.pos.x
+                if cell.citytile is not None:
+                    any_citytile[y, x] = True
+                    own_citytile[y, x] = cell.citytile.team == team
+                has_resource[y, x] = cell.has_resource()
+                road[y, x] = cell.road
+
+        blocked = any_citytile & ~own_citytile
+        for other in game.players:
+            for unit in other.units:
+                if not own_citytile[unit.pos.y, unit.pos.x]:
+                    blocked[unit.pos.y, unit.pos.x] = True
+
+        units = player.units
+        self.unit_index = {unit.id: i for i, unit in enumerate(units)}
+        xs = np.array([unit.pos.x for unit in units], dtype=int)
+        ys = np.array([unit.pos.y for unit in units], dtype=int)
+        can_act = np.array([unit.can_act() for unit in units], dtype=bool)
+        is_worker = np.array([unit.is_worker() for unit in units], dtype=bool)
+        cargo = np.array([unit.cargo.wood + unit.cargo.coal + unit.cargo.uranium for unit in units])
+
+        self.units = np.zeros((len(units), len(UNIT_ACTIONS)), dtype=bool)
+        self.units[:, UNIT_ACTION[DIRECTIONS.CENTER]] = True
+        for direction, dx, dy in MOVES:
+            nx, ny = xs + dx, ys + dy
+            on_map = (nx >= 0) & (nx < game_map.width) & (ny >= 0) & (ny < game_map.height)
+            free = ~blocked[np.clip(ny, 0, game_map.height - 1), np.clip(nx, 0, game_map.width - 1)]
+            self.units[:, UNIT_ACTION[direction]] = can_act & on_map & free
+        if len(units) > 0:
+            self.units[:, UNIT_ACTION["bcity"]] = (
+                can_act & is_worker & (cargo >= PARAMETERS["CITY_BUILD_COST"])
+                & ~has_resource[ys, xs] & ~any_citytile[ys, xs]
+            )
+            self.units[:, UNIT_ACTION["p"]] = can_act & is_worker & (road[ys, xs] > 0) & ~any_citytile[ys, xs]
+
+        citytiles = [citytile for city in player.cities.values() for citytile in city.citytiles]
+        self.citytile_index = {(citytile.pos.x, citytile.pos.y): i for i, citytile in enumerate(citytiles)}
+        ct_can_act = np.array([citytile.can_act() for citytile in citytiles], dtype=bool)
+        can_build_unit = len(units) < player.city_tile_count
+
+        self.citytiles = np.zeros((len(citytiles), len(CITYTILE_ACTIONS)), dtype=bool)
+        self.citytiles[:, CITYTILE_ACTION["r"]] = ct_can_act
+        self.citytiles[:, CITYTILE_ACTION["bw"]] = ct_can_act & can_build_unit
+        self.citytiles[:, CITYTILE_ACTION["bc"]] = ct_can_act & can_build_unit
+
+    def unit_can(self, unit, action) -> bool:
+        """
+        action is a direction or "bcity" / "p"
+        """
+        return bool(self.units[self.unit_index[unit.id], UNIT_ACTION[action]])
+
+    def citytile_can(self, citytile, action) -> bool:
+        """
+        action is "r" / "bw" / "bc"
+        """
+        return bool(self.citytiles[self.citytile_index[(citytile.pos.x, citytile.pos.y)], CITYTILE_ACTION[action]])
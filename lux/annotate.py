@@ -14,3 +14,74 @@ def text(x: int, y: int, message: str, fontsize: int = 16) -> str:
 # text besides map
 def sidetext(message: str) -> str:
     return f"dst '{message}'"
+
+# x is shadowed by the coordinate arguments of AnnotationBuffer
+_cross = x
+
+# annotation levels for AnnotationBuffer, higher levels are more verbose
+OFF = 0
+INFO = 1
+DEBUG = 2
+TRACE = 3
+
+
+class AnnotationBuffer:
+    """
+    Collects the annotations of one turn and only formats them in flush. Anything above level is
+    dropped on the spot, so with level OFF a call costs one comparison. Messages are str.format
+    strings with their arguments, or callables returning the message, and are never built when
+    dropped. Identical commands are sent once and at most max_commands are sent per turn.
+    """
+    def __init__(self, level: int = OFF, max_commands: int = 100):
+        self.level = level
+        self.max_commands = max_commands
+        # (command function, args) in the order they were added
+        self._commands = []
+
+    def enabled(self, level: int = INFO) -> bool:
+        return level <= self.level
+
+    def circle(self, x: int, y: int, level: int = INFO):
+        if level <= self.level:
+            self._add(circle, x, y)
+
+    def x(self, x: int, y: int, level: int = INFO):
+        if level <= self.level:
+            self._add(_cross, x, y)
+
+    def line(self, x1: int, y1: int, x2: int, y2: int, level: int = INFO):
+        if level <= self.level:
+            self._add(line, x1, y1, x2, y2)
+
+    def text(self, x: int, y: int, message, *args, fontsize: int = 16, level: int = INFO):
+        if level <= self.level:
+            self._add(text, x, y, (message, args), fontsize)
+
+    def sidetext(self, message, *args, level: int = INFO):
+        if level <= self.level:
+            self._add(sidetext, (message, args))
+
+    def _add(self, command, *args):
+        self._commands.append((command, args))
+
+    def flush(self) -> list:
+        """
+        returns the formatted commands of this turn, to be appended to the actions, and clears the buffer
+        """
+        # deduplicated on the formatted command, format arguments need not be hashable
+        commands = {}
+        for command, args in self._commands:
+            if len(commands) >= self.max_commands:
+                break
+            commands.setdefault(command(*[_format(arg) for arg in args]))
+        self._commands = []
+        return list(commands)
+
+
+def _format(arg):
+    if not isinstance(arg, tuple):
+        return arg
+    message, args = arg
+    if callable(message):
+        return message()
+    return message.format(*args) if args else message
@@ -20,3 +20,14 @@ class Constants:
         WOOD = "wood"
         URANIUM = "uranium"
         COAL = "coal"
+    class EVENT_TYPES:
+        UNIT_SPAWNED = "unit_spawned"
+        UNIT_DIED = "unit_died"
+        UNIT_MOVED = "unit_moved"
+        CITY_FOUNDED = "city_founded"
+        CITY_LOST = "city_lost"
+        CITY_MERGED = "city_merged"
+        CITY_TILE_BUILT = "city_tile_built"
+        TILE_DEPLETED = "tile_depleted"
+        RESEARCH_THRESHOLD = "research_threshold"
+        ROAD_UPGRADED = "road_upgraded"
@@ -0,0 +1,136 @@
+import numpy as np
+
+from .game import Game
+from .game_constants import GAME_CONSTANTS
+
+PARAMETERS = GAME_CONSTANTS["PARAMETERS"]
+
+# every map is padded to this size, smaller maps are centered
+MAP_SIZE = 32
+
+# planes prefixed own_ / opp_ are seen from the team passed to encode
+FEATURE_PLANES = (
+    "on_map",
+    "own_workers",
+    "own_carts",
+    "opp_workers",
+    "opp_carts",
+    "own_cargo",
+    "opp_cargo",
+    "own_unit_cooldown",
+    "opp_unit_cooldown",
+    "own_citytiles",
+    "opp_citytiles",
+    "own_city_fuel",
+    "opp_city_fuel",
+    "own_citytile_cooldown",
+    "opp_citytile_cooldown",
+    "wood",
+    "coal",
+    "uranium",
+    "road",
+    "night",
+    "day_phase",
+    "turn",
+    "own_research",
+    "opp_research",
+)
+PLANE = {name: i for i, name in enumerate(FEATURE_PLANES)}
+
+
+def encode(game: Game, team: int, out=None) -> np.ndarray:
+    """
+    encodes the game seen by team as float32 feature planes of shape (len(FEATURE_PLANES), MAP_SIZE, MAP_SIZE)
+    counts and amounts are scaled to roughly [0, 1]. Pass out to fill a preallocated array instead
+    """
+    if out is None:
+        out = np.zeros((len(FEATURE_PLANES), MAP_SIZE, MAP_SIZE), dtype=np.float32)
+    else:
+        out[:] = 0
+    ox = (MAP_SIZE - game.map_width) // 2
+    oy = (MAP_SIZE - game.map_height) // 2
+    out[PLANE["on_map"], oy:oy + game.map_height, ox:ox + game.map_width] = 1
+
+    cycle = PARAMETERS["DAY_LENGTH"] + PARAMETERS["NIGHT_LENGTH"]
+    out[PLANE["night"]] = game.turn % cycle >= PARAMETERS["DAY_LENGTH"]
+    out[PLANE["day_phase"]] = (game.turn % cycle) / cycle
+    out[PLANE["turn"]] = game.turn / PARAMETERS["MAX_DAYS"]
+
+    for player in game.players:
+        side = "own" if player.team == team else "opp"
+        out[PLANE[side + "_research"]] = min(player.research_points / PARAMETERS["RESEARCH_REQUIREMENTS"]["URANIUM"], 1)
+
+        for unit in player.units:
+            y, x = unit.pos.y + oy, unit.pos.x + ox
+            if unit.is_worker():
+                out[PLANE[side + "_workers"], y, x] += 1
+                capacity = PARAMETERS["RESOURCE_CAPACITY"]["WORKER"]
+                max_cooldown = PARAMETERS["UNIT_ACTION_COOLDOWN"]["WORKER"]
+            else:
+                out[PLANE[side + "_carts"], y, x] += 1
+                capacity = PARAMETERS["RESOURCE_CAPACITY"]["CART"]
+                max_cooldown = PARAMETERS["UNIT_ACTION_COOLDOWN"]["CART"]
+            out[PLANE[side + "_cargo"], y, x] += (unit.cargo.wood + unit.cargo.coal + unit.cargo.uranium) / capacity
+            out[PLANE[side + "_unit_cooldown"], y, x] = max(out[PLANE[side + "_unit_cooldown"], y, x], unit.cooldown / max_cooldown)
+
+        for city in player.cities.values():
+            # share of a full night the city can stay lit
+            nights = min(city.fuel / (city.get_light_upkeep() * PARAMETERS["NIGHT_LENGTH"]), 1) if city.get_light_upkeep() > 0 else 1
+            for citytile in city.citytiles:
+                y, x = citytile.pos.y + oy, citytile.pos.x + ox
+                out[PLANE[side + "_citytiles"], y, x] = 1
+                out[PLANE[side + "_city_fuel"], y, x] = nights
+                out[PLANE[side + "_citytile_cooldown"], y, x] = citytile.cooldown / PARAMETERS["CITY_ACTION_COOLDOWN"]
+
+    for row in game.map.map:
+        for cell in row:
+            y, x = cell.pos.y + oy, cell.pos.x + ox
+            if cell.road:
+                out[PLANE["road"], y, x] = cell.road / PARAMETERS["MAX_ROAD"]
+            if cell.has_resource():
+                out[PLANE[cell.resource.type], y, x] = cell.resource.amount / PARAMETERS["MAX_WOOD_AMOUNT"]
+
+    return out
+
+
+def replay_updates(replay):
+    """
+    yields the update messages of each step of a kaggle replay (the parsed replay json)
+    """
+    for step in replay["steps"]:
+        yield step[0]["observation"]["updates"]
+
+
+def iter_game_states(updates):
+    """
+    replays an iterable of per step update messages, as an agent receives them, and yields the
+    game after each step. The same Game object is updated in place and yielded every time
+    """
+    game = None
+    for messages in updates:
+        if game is None:
+            game = Game()
+            game._initialize(messages)
+            game._update(messages[2:])
+        else:
+            game._update(messages)
+        yield game
+
+
+def iter_feature_batches(update_streams, team, batch_size=256):
+    """
+    encodes every step of every stream of per step update messages (e.g. replay_updates of each
+    replay) into batches of shape (batch_size, len(FEATURE_PLANES), MAP_SIZE, MAP_SIZE). Streams are
+    consumed lazily so only the batch being filled is buffered, the last batch may be smaller
+    """
+    batch = np.zeros((batch_size, len(FEATURE_PLANES), MAP_SIZE, MAP_SIZE), dtype=np.float32)
+    size = 0
+    for updates in update_streams:
+        for game in iter_game_states(updates):
+            encode(game, team, out=batch[size])
+            size += 1
+            if size == batch_size:
+                yield batch.copy()
+                size = 0
+    if size > 0:
+        yield batch[:size].copy()
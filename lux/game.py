@@ -1,8 +1,11 @@
 from .constants import Constants
-from .game_map import GameMap
+from .game_map import GameMap, Cell, Position
 from .game_objects import Player, Unit, City, CityTile
+from .game_constants import GAME_CONSTANTS
+from .game_events import GameEvent
 
 INPUT_CONSTANTS = Constants.INPUT_CONSTANTS
+EVENT_TYPES = Constants.EVENT_TYPES
 
 
 class Game:
@@ -18,6 +21,38 @@ class Game:
         self.map_height = int(mapInfo[1])
         self.map = GameMap(self.map_width, self.map_height)
         self.players = [Player(0), Player(1)]
+        # mirror axis of the map found at step 0, see GameMap.find_symmetry
+        self.symmetry = None
+        # what changed during the last _update, see GameEvent
+        self.events = []
+        self._resource_positions = set()
+
+    def fork(self) -> 'Game':
+        """
+        returns a copy-on-write snapshot of the game for trying out actions. Map rows, units
+        and cities are shared with this game until one side modifies them through
+        get_cell_mut, get_city_mut or player.get_unit_mut
+        """
+        fork = Game.__new__(Game)
+        fork.__dict__.update(self.__dict__)
+        fork.map = self.map.fork()
+        fork.players = [player.fork() for player in self.players]
+        return fork
+
+    def get_cell_mut(self, x, y) -> Cell:
+        """
+        returns a cell that is safe to modify, including the city tile on it
+        """
+        cell = self.map.get_cell_mut(x, y)
+        if cell.citytile is not None:
+            self.get_city_mut(cell.citytile.team, cell.citytile.cityid)
+        return cell
+
+    def get_city_mut(self, team, cityid) -> City:
+        """
+        returns a city of team that is safe to modify, including its city tiles
+        """
+        return self.players[team].get_city_mut(cityid, self.map)
 
     def _end_turn(self):
         print("D_FINISH")
@@ -34,7 +69,16 @@ class Game:
         """
         update state
         """
+        prev_map = self.map
+        prev_units = {unit.id: unit for player in self.players for unit in player.units}
+        prev_cities = {cityid: city for player in self.players for cityid, city in player.cities.items()}
+        prev_research = [player.research_points for player in self.players]
+        prev_resource_positions = self._resource_positions
+        self._resource_positions = set()
+        road_positions = []
+
         self.map = GameMap(self.map_width, self.map_height)
+        self.map.symmetry = self.symmetry
         self.turn += 1
         self._reset_player_states()
 
@@ -52,6 +96,7 @@ class Game:
                 y = int(strs[3])
                 amt = int(float(strs[4]))
                 self.map._setResource(r_type, x, y, amt)
+                self._resource_positions.add((x, y))
             elif input_identifier == INPUT_CONSTANTS.UNITS:
                 unittype = int(strs[1])
                 team = int(strs[2])
@@ -84,3 +129,64 @@ class Game:
                 y = int(strs[2])
                 road = float(strs[3])
                 self.map.get_cell(x, y).road = road
+                road_positions.append((x, y))
+
+        if self.turn == 0:
+            occupied = self._resource_positions | {(ct.pos.x, ct.pos.y) for player in self.players
+                                                   for city in player.cities.values() for ct in city.citytiles}
+            self.symmetry = self.map.symmetry = self.map.find_symmetry(occupied)
+
+        self._set_turn_events(prev_map, prev_units, prev_cities, prev_research, prev_resource_positions, road_positions)
+
+    def _set_turn_events(self, prev_map, prev_units, prev_cities, prev_research, prev_resource_positions, road_positions):
+        """
+        diff the previous turn against the current state and store the resulting GameEvents in self.events
+        """
+        events = self.events = []
+
+        units = {unit.id: unit for player in self.players for unit in player.units}
+        for unitid, unit in units.items():
+            prev_unit = prev_units.get(unitid)
+            if prev_unit is None:
+                events.append(GameEvent(EVENT_TYPES.UNIT_SPAWNED, unit.team, unitid, unit.pos))
+            elif prev_unit.pos != unit.pos:
+                events.append(GameEvent(EVENT_TYPES.UNIT_MOVED, unit.team, unitid, unit.pos, prev_unit.pos))
+        for unitid, prev_unit in prev_units.items():
+            if unitid not in units:
+                events.append(GameEvent(EVENT_TYPES.UNIT_DIED, prev_unit.team, unitid, prev_unit.pos))
+
+        cities = {cityid: city for player in self.players for cityid, city in player.cities.items()}
+        city_of_tile = {(ct.pos.x, ct.pos.y): city.cityid for city in cities.values() for ct in city.citytiles}
+        prev_city_of_tile = {(ct.pos.x, ct.pos.y): city.cityid for city in prev_cities.values() for ct in city.citytiles}
+        for cityid, city in cities.items():
+            if cityid not in prev_cities:
+                events.append(GameEvent(EVENT_TYPES.CITY_FOUNDED, city.team, cityid, city.citytiles[0].pos))
+            for ct in city.citytiles:
+                if (ct.pos.x, ct.pos.y) not in prev_city_of_tile:
+                    events.append(GameEvent(EVENT_TYPES.CITY_TILE_BUILT, city.team, cityid, ct.pos))
+        for cityid, prev_city in prev_cities.items():
+            if cityid in cities:
+                continue
+            # a city that disappears while its tiles still stand was joined to a neighbour
+            merged_into = [city_of_tile[(ct.pos.x, ct.pos.y)] for ct in prev_city.citytiles
+                           if (ct.pos.x, ct.pos.y) in city_of_tile]
+            if merged_into:
+                events.append(GameEvent(EVENT_TYPES.CITY_MERGED, prev_city.team, cityid, prev_city.citytiles[0].pos, merged_into[0]))
+            else:
+                events.append(GameEvent(EVENT_TYPES.CITY_LOST, prev_city.team, cityid, prev_city.citytiles[0].pos))
+
+        for x, y in prev_resource_positions - self._resource_positions:
+            r_type = prev_map.get_cell(x, y).resource.type
+            events.append(GameEvent(EVENT_TYPES.TILE_DEPLETED, pos=Position(x, y), value=r_type))
+
+        for x, y in road_positions:
+            road = self.map.get_cell(x, y).road
+            if road > prev_map.get_cell(x, y).road:
+                events.append(GameEvent(EVENT_TYPES.ROAD_UPGRADED, pos=Position(x, y), value=road))
+
+        requirements = GAME_CONSTANTS["PARAMETERS"]["RESEARCH_REQUIREMENTS"]
+        for player in self.players:
+            for r_type in [Constants.RESOURCE_TYPES.COAL, Constants.RESOURCE_TYPES.URANIUM]:
+                requirement = requirements[r_type.upper()]
+                if prev_research[player.team] < requirement <= player.research_points:
+                    events.append(GameEvent(EVENT_TYPES.RESEARCH_THRESHOLD, player.team, value=r_type))
@@ -0,0 +1,26 @@
+from .game_map import Position
+
+
+class GameEvent:
+    """
+    a change between two consecutive turns, see Constants.EVENT_TYPES.
+
+    team: team the unit / city belongs to, None for map events
+    id: unit id or city id, None for map events
+    pos: position the event happened at
+    value: event specific detail
+        UNIT_MOVED: position the unit moved from
+        CITY_MERGED: id of the city it was merged into
+        TILE_DEPLETED: resource type that ran out
+        RESEARCH_THRESHOLD: resource type that is now researched
+        ROAD_UPGRADED: new road level
+    """
+    def __init__(self, e_type: str, team: int = None, id: str = None, pos: Position = None, value=None):
+        self.type = e_type
+        self.team = team
+        self.id = id
+        self.pos = pos
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"GameEvent({self.type}, team={self.team}, id={self.id}, pos={self.pos}, value={self.value})"
@@ -21,6 +21,14 @@ class Cell:
         self.road = 0
     def has_resource(self):
         return self.resource is not None and self.resource.amount > 0
+    def _copy(self) -> 'Cell':
+        cell = Cell.__new__(Cell)
+        cell.pos = self.pos
+        cell.resource = Resource(self.resource.type, self.resource.amount) if self.resource is not None else None
+        # a shared row also shares its city tiles, the owning City adopts this copy in get_city_mut
+        cell.citytile = self.citytile._copy() if self.citytile is not None else None
+        cell.road = self.road
+        return cell
 
 
 class GameMap:
@@ -32,6 +40,11 @@ class GameMap:
             self.map[y] = [None] * width
             for x in range(0, self.width):
                 self.map[y][x] = Cell(x, y)
+        # rows still shared with another fork, copied on first write
+        self._shared_rows = set()
+        # mirror axis of the map, "x" if (x, y) mirrors to (width - 1 - x, y), "y" if it mirrors
+        # to (x, height - 1 - y), None if unknown. Set by Game from find_symmetry at step 0
+        self.symmetry = None
 
     def get_cell_by_pos(self, pos) -> Cell:
         return self.map[pos.y][pos.x]
@@ -39,6 +52,66 @@ class GameMap:
     def get_cell(self, x, y) -> Cell:
         return self.map[y][x]
 
+    def get_cell_mut(self, x, y) -> Cell:
+        """
+        returns a cell that is safe to modify, copying its row first if it is shared with a fork.
+        Use Game.get_cell_mut to modify its citytile, so the owning City sees the change too
+        """
+        if y in self._shared_rows:
+            self.map[y] = [cell._copy() for cell in self.map[y]]
+            self._shared_rows.discard(y)
+        return self.map[y][x]
+
+    def fork(self) -> 'GameMap':
+        """
+        returns a copy-on-write snapshot of this map. Rows are shared by both maps until
+        one of them writes to it through get_cell_mut
+        """
+        fork = GameMap.__new__(GameMap)
+        fork.height = self.height
+        fork.width = self.width
+        fork.map = list(self.map)
+        fork.symmetry = self.symmetry
+        fork._shared_rows = set(range(self.height))
+        self._shared_rows = set(range(self.height))
+        return fork
+
+    def find_symmetry(self, positions=None):
+        """
+        returns the axis the resources and city tiles of this map are mirrored along, "x", "y" or None.
+        positions, the (x, y) of every occupied cell, saves scanning the whole map
+        """
+        if positions is None:
+            occupied = [cell for row in self.map for cell in row if cell.resource is not None or cell.citytile is not None]
+        else:
+            occupied = [self.map[y][x] for x, y in positions]
+        last_x, last_y = self.width - 1, self.height - 1
+        if all(self._mirrors(cell, self.map[cell.pos.y][last_x - cell.pos.x]) for cell in occupied):
+            return "x"
+        if all(self._mirrors(cell, self.map[last_y - cell.pos.y][cell.pos.x]) for cell in occupied):
+            return "y"
+        return None
+
+    @staticmethod
+    def _mirrors(cell, other) -> bool:
+        if (cell.resource is None) != (other.resource is None):
+            return False
+        if cell.resource is not None and (cell.resource.type != other.resource.type or cell.resource.amount != other.resource.amount):
+            return False
+        return (cell.citytile is None) == (other.citytile is None)
+
+    def mirror(self, pos, axis=None) -> 'Position':
+        """
+        returns the position mirroring pos across axis, by default the symmetry axis of the map.
+        The mirror of an opponent's position is where we would be in their place
+        """
+        axis = axis or self.symmetry
+        if axis == "x":
+            return Position(self.width - 1 - pos.x, pos.y)
+        elif axis == "y":
+            return Position(pos.x, self.height - 1 - pos.y)
+        return None
+
     def _setResource(self, r_type, x, y, amount):
         """
         do not use this function, this is for internal tracking of state
@@ -14,10 +14,51 @@ class Player:
         self.units: list[Unit] = []
         self.cities: Dict[str, City] = {}
         self.city_tile_count = 0
+        # ids of units and cities still shared with another fork, copied on first write
+        self._shared_units = set()
+        self._shared_cities = set()
     def researched_coal(self) -> bool:
         return self.research_points >= GAME_CONSTANTS["PARAMETERS"]["RESEARCH_REQUIREMENTS"]["COAL"]
     def researched_uranium(self) -> bool:
         return self.research_points >= GAME_CONSTANTS["PARAMETERS"]["RESEARCH_REQUIREMENTS"]["URANIUM"]
+    def get_unit_mut(self, unitid) -> 'Unit':
+        """
+        returns the unit with the given id, copying it first if it is shared with a fork
+        """
+        for i, unit in enumerate(self.units):
+            if unit.id == unitid:
+                if unitid in self._shared_units:
+                    unit = unit._copy()
+                    self.units[i] = unit
+                    self._shared_units.discard(unitid)
+                return unit
+        return None
+    def get_city_mut(self, cityid, game_map) -> 'City':
+        """
+        returns the city with the given id, copying it first if it is shared with a fork.
+        The copy takes over the city tiles of game_map's cells so map and city stay in sync
+        """
+        city = self.cities.get(cityid)
+        if city is not None and cityid in self._shared_cities:
+            city = city._copy(game_map)
+            self.cities[cityid] = city
+            self._shared_cities.discard(cityid)
+        return city
+    def fork(self) -> 'Player':
+        """
+        returns a copy-on-write snapshot of this player. Units and cities are shared by both
+        players until one of them modifies them through get_unit_mut / get_city_mut
+        """
+        fork = Player(self.team)
+        fork.research_points = self.research_points
+        fork.units = list(self.units)
+        fork.cities = dict(self.cities)
+        fork.city_tile_count = self.city_tile_count
+        fork._shared_units = {unit.id for unit in self.units}
+        fork._shared_cities = set(self.cities)
+        self._shared_units = set(fork._shared_units)
+        self._shared_cities = set(fork._shared_cities)
+        return fork
 
 
 class City:
@@ -33,6 +74,10 @@ class City:
         return ct
     def get_light_upkeep(self):
         return self.light_upkeep
+    def _copy(self, game_map) -> 'City':
+        city = City(self.team, self.cityid, self.fuel, self.light_upkeep)
+        city.citytiles = [game_map.get_cell_mut(ct.pos.x, ct.pos.y).citytile for ct in self.citytiles]
+        return city
 
 
 class CityTile:
@@ -41,6 +86,8 @@ class CityTile:
         self.team = teamid
         self.pos = Position(x, y)
         self.cooldown = cooldown
+    def _copy(self) -> 'CityTile':
+        return CityTile(self.team, self.cityid, self.pos.x, self.pos.y, self.cooldown)
     def can_act(self) -> bool:
         """
         Whether or not this unit can research or build
@@ -84,6 +131,10 @@ class Unit:
         self.cargo.wood = wood
         self.cargo.coal = coal
         self.cargo.uranium = uranium
+    def _copy(self) -> 'Unit':
+        return Unit(self.team, self.type, self.id, self.pos.x, self.pos.y, self.cooldown,
+                    self.cargo.wood, self.cargo.coal, self.cargo.uranium)
+
     def is_worker(self) -> bool:
         return self.type == UNIT_TYPES.WORKER
 
@@ -0,0 +1,237 @@
+from typing import Dict, List, Set, Tuple
+
+from .constants import Constants
+from .game_map import GameMap, Position
+from .game_constants import GAME_CONSTANTS
+
+EVENT_TYPES = Constants.EVENT_TYPES
+RESOURCE_TYPES = Constants.RESOURCE_TYPES
+
+NEIGHBOURS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+class ResourceCluster:
+    def __init__(self, clusterid: int, r_type: str, tiles: Set[Tuple[int, int]]):
+        self.id = clusterid
+        self.type = r_type
+        self.tiles = tiles
+        # total fuel left on the tiles of this cluster
+        self.fuel = 0
+        # empty cells next to the cluster a city can be built on
+        self.build_sites: Set[Tuple[int, int]] = set()
+        # presence per team, units standing on the cluster or its build sites and city tiles bordering it
+        self.units = [0, 0]
+        self.citytiles = [0, 0]
+        # cluster on the other side of the map's mirror axis, itself if it spans the axis
+        self.mirror: ResourceCluster = None
+        self.center = Position(
+            round(sum(x for x, y in tiles) / len(tiles)),
+            round(sum(y for x, y in tiles) / len(tiles)),
+        )
+
+    def is_depleted(self) -> bool:
+        return len(self.tiles) == 0
+
+    def nearest_tile(self, pos, exclude=()) -> Position:
+        """
+        closest tile to pos that is not in exclude, or the closest tile if all of them are
+        """
+        tiles = [tile for tile in self.tiles if tile not in exclude] or self.tiles
+        x, y = min(tiles, key=lambda tile: abs(tile[0] - pos.x) + abs(tile[1] - pos.y))
+        return Position(x, y)
+
+    def _update_fuel(self, game_map: GameMap):
+        fuel_rate = GAME_CONSTANTS["PARAMETERS"]["RESOURCE_TO_FUEL_RATE"][self.type.upper()]
+        self.fuel = sum(game_map.get_cell(x, y).resource.amount for x, y in self.tiles) * fuel_rate
+
+    def _update_borders(self, game_map: GameMap):
+        self.build_sites = set()
+        self.citytiles = [0, 0]
+        seen = set()
+        for x, y in self.tiles:
+            for dx, dy in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if (nx, ny) in seen or not (0 <= nx < game_map.width and 0 <= ny < game_map.height):
+                    continue
+                seen.add((nx, ny))
+                cell = game_map.map[ny][nx]
+                if cell.citytile is not None:
+                    self.citytiles[cell.citytile.team] += 1
+                elif not cell.has_resource():
+                    self.build_sites.add((nx, ny))
+
+
+class ResourceClusters:
+    """
+    Groups resource tiles of the same type into 4-connected clusters once at step 0 and keeps
+    their fuel, build sites and team presence up to date from the turn's GameEvents.
+    On mirrored maps only one half is flood filled and the clusters are mirrored to the other.
+    """
+    def __init__(self, game_state):
+        game_map = game_state.map
+        self.clusters: List[ResourceCluster] = []
+        self._cluster_of: Dict[Tuple[int, int], ResourceCluster] = {}
+        # tiles units were sent to this turn, see claim
+        self._claimed: Set[Tuple[int, int]] = set()
+
+        width, height = game_map.width, game_map.height
+        if game_map.symmetry == "x":
+            middle = (width - 1) // 2
+            half_width, half_height = middle + 1, height
+            in_half = lambda x, y: x <= middle
+            on_axis = lambda x, y: x == middle
+            mirror = lambda x, y: (width - 1 - x, y)
+        elif game_map.symmetry == "y":
+            middle = (height - 1) // 2
+            half_width, half_height = width, middle + 1
+            in_half = lambda x, y: y <= middle
+            on_axis = lambda x, y: y == middle
+            mirror = lambda x, y: (x, height - 1 - y)
+        else:
+            half_width, half_height = width, height
+            in_half = lambda x, y: True
+
+        for y in range(half_height):
+            row = game_map.map[y]
+            for x in range(half_width):
+                cell = row[x]
+                if not cell.has_resource() or (x, y) in self._cluster_of:
+                    continue
+                tiles = self._flood_fill(game_map, x, y, in_half)
+                if game_map.symmetry is None:
+                    self._add_cluster(ResourceCluster(len(self.clusters), cell.resource.type, tiles))
+                    continue
+                mirrored = {mirror(tx, ty) for tx, ty in tiles}
+                if any(on_axis(tx, ty) for tx, ty in tiles):
+                    # touches its own mirror image across the axis
+                    cluster = ResourceCluster(len(self.clusters), cell.resource.type, tiles | mirrored)
+                    cluster.mirror = cluster
+                    self._add_cluster(cluster)
+                else:
+                    cluster = ResourceCluster(len(self.clusters), cell.resource.type, tiles)
+                    self._add_cluster(cluster)
+                    cluster.mirror = ResourceCluster(len(self.clusters), cell.resource.type, mirrored)
+                    cluster.mirror.mirror = cluster
+                    self._add_cluster(cluster.mirror)
+
+        for cluster in self.clusters:
+            if cluster.mirror is None or cluster.mirror is cluster:
+                cluster._update_fuel(game_map)
+                cluster._update_borders(game_map)
+            elif cluster.id < cluster.mirror.id:
+                cluster._update_fuel(game_map)
+                cluster._update_borders(game_map)
+                # find_symmetry matched amounts and city tiles, the opponent owns the mirrored cities
+                cluster.mirror.fuel = cluster.fuel
+                cluster.mirror.build_sites = {mirror(x, y) for x, y in cluster.build_sites}
+                cluster.mirror.citytiles = cluster.citytiles[::-1]
+        self._index_build_sites()
+
+    def _flood_fill(self, game_map: GameMap, x, y, in_half) -> Set[Tuple[int, int]]:
+        r_type = game_map.get_cell(x, y).resource.type
+        tiles = {(x, y)}
+        stack = [(x, y)]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if (nx, ny) in tiles or not (0 <= nx < game_map.width and 0 <= ny < game_map.height) or not in_half(nx, ny):
+                    continue
+                cell = game_map.map[ny][nx]
+                if cell.has_resource() and cell.resource.type == r_type:
+                    tiles.add((nx, ny))
+                    stack.append((nx, ny))
+        return tiles
+
+    def _add_cluster(self, cluster: ResourceCluster):
+        self.clusters.append(cluster)
+        for tile in cluster.tiles:
+            self._cluster_of[tile] = cluster
+
+    def _index_build_sites(self):
+        self._clusters_of_site: Dict[Tuple[int, int], List[ResourceCluster]] = {}
+        for cluster in self.clusters:
+            for site in cluster.build_sites:
+                self._clusters_of_site.setdefault(site, []).append(cluster)
+
+    def _clusters_near(self, x, y) -> Set[ResourceCluster]:
+        near = set(self._clusters_of_site.get((x, y), []))
+        for dx, dy in [(0, 0)] + NEIGHBOURS:
+            cluster = self._cluster_of.get((x + dx, y + dy))
+            if cluster is not None:
+                near.add(cluster)
+        return near
+
+    def update(self, game_state):
+        """
+        call once per turn after game_state._update
+        """
+        game_map = game_state.map
+        self._claimed = set()
+        dirty = set()
+        for event in game_state.events:
+            if event.type == EVENT_TYPES.TILE_DEPLETED:
+                cluster = self._cluster_of.pop((event.pos.x, event.pos.y), None)
+                if cluster is not None:
+                    cluster.tiles.discard((event.pos.x, event.pos.y))
+                    dirty.add(cluster)
+                # the emptied tile may now be a build site of a neighbouring cluster
+                dirty.update(self._clusters_near(event.pos.x, event.pos.y))
+            elif event.type == EVENT_TYPES.CITY_TILE_BUILT:
+                dirty.update(self._clusters_near(event.pos.x, event.pos.y))
+            elif event.type == EVENT_TYPES.CITY_LOST:
+                # only one tile of the lost city is known, recheck every border
+                dirty.update(self.clusters)
+
+        for cluster in dirty:
+            cluster._update_borders(game_map)
+        if dirty:
+            self._index_build_sites()
+
+        for cluster in self.clusters:
+            cluster._update_fuel(game_map)
+            cluster.units = [0, 0]
+        for player in game_state.players:
+            for unit in player.units:
+                pos = (unit.pos.x, unit.pos.y)
+                cluster = self._cluster_of.get(pos)
+                if cluster is not None:
+                    cluster.units[player.team] += 1
+                for cluster in self._clusters_of_site.get(pos, []):
+                    cluster.units[player.team] += 1
+
+    def cluster_at(self, pos) -> ResourceCluster:
+        return self._cluster_of.get((pos.x, pos.y))
+
+    def claim(self, cluster: ResourceCluster, pos, team) -> Position:
+        """
+        sends a unit of team at pos to cluster for the rest of this turn and returns the closest
+        tile no other unit was sent to. The unit counts towards the cluster's presence, so later
+        expansion_target calls this turn spread out over other clusters
+        """
+        tile = cluster.nearest_tile(pos, self._claimed)
+        self._claimed.add((tile.x, tile.y))
+        cluster.units[team] += 1
+        return tile
+
+    def expansion_target(self, pos, player, min_dist=0) -> ResourceCluster:
+        """
+        closest cluster at least min_dist away that the player can mine and the enemy has not
+        settled, preferring clusters with tiles left to claim and none of our units heading there yet
+        """
+        enemy = (player.team + 1) % 2
+        best, best_key = None, None
+        for cluster in self.clusters:
+            if cluster.is_depleted() or cluster.units[enemy] > 0 or cluster.citytiles[enemy] > 0:
+                continue
+            if cluster.type == RESOURCE_TYPES.COAL and not player.researched_coal():
+                continue
+            if cluster.type == RESOURCE_TYPES.URANIUM and not player.researched_uranium():
+                continue
+            dist = cluster.center.distance_to(pos)
+            if dist < min_dist:
+                continue
+            key = (cluster.tiles <= self._claimed, cluster.units[player.team] > 0, dist)
+            if best_key is None or key < best_key:
+                best, best_key = cluster, key
+        return best
@@ -0,0 +1,96 @@
+import numpy as np
+
+from .constants import Constants
+from .game_map import GameMap
+from .game_constants import GAME_CONSTANTS
+
+RESOURCE_TYPES = Constants.RESOURCE_TYPES
+PARAMETERS = GAME_CONSTANTS["PARAMETERS"]
+
+NEIGHBOURS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+
+class ResourceForecast:
+    """
+    Projects the amount left on every resource tile a number of turns ahead, for the whole map at
+    once. Each turn every harvester standing on or next to a tile collects WORKER_COLLECTION_RATE
+    from it, then wood below MAX_WOOD_AMOUNT regrows by WOOD_GROWTH_RATE, as the engine does.
+    Arrays are indexed [y, x].
+    """
+    def __init__(self, game_map: GameMap, harvesters=(), player=None):
+        """
+        harvesters: positions of the workers expected to keep mining where they stand
+        player: if given, harvesters collect nothing from resources the player has not researched
+        """
+        shape = (game_map.height, game_map.width)
+        self.amount = np.zeros(shape)
+        self.is_wood = np.zeros(shape, dtype=bool)
+        self.collection_rate = np.zeros(shape)
+        self.fuel_rate = np.zeros(shape)
+
+        for row in game_map.map:
+            for cell in row:
+                if not cell.has_resource():
+                    continue
+                r_type = cell.resource.type
+                if r_type == RESOURCE_TYPES.COAL and player is not None and not player.researched_coal():
+                    rate = 0
+                elif r_type == RESOURCE_TYPES.URANIUM and player is not None and not player.researched_uranium():
+                    rate = 0
+                else:
+                    rate = PARAMETERS["WORKER_COLLECTION_RATE"][r_type.upper()]
+                y, x = cell.pos.y, cell.pos.x
+                self.amount[y, x] = cell.resource.amount
+                self.is_wood[y, x] = r_type == RESOURCE_TYPES.WOOD
+                self.collection_rate[y, x] = rate
+                self.fuel_rate[y, x] = PARAMETERS["RESOURCE_TO_FUEL_RATE"][r_type.upper()]
+
+        # a harvester collects from its own tile and the four adjacent ones
+        on_tile = np.zeros(shape)
+        for pos in harvesters:
+            on_tile[pos.y, pos.x] += 1
+        padded = np.pad(on_tile, 1)
+        self.harvesters = on_tile.copy()
+        for dx, dy in NEIGHBOURS:
+            self.harvesters += padded[1 + dy:1 + dy + shape[0], 1 + dx:1 + dx + shape[1]]
+
+    def project(self, turns, extra_harvesters=0):
+        """
+        returns per tile (amount left after the given number of turns, fuel collected from the tile
+        until then, fuel each of its harvesters collects until then). Harvesters split a tile evenly
+        when it cannot fill all of them. extra_harvesters adds that many harvesters to every tile,
+        e.g. 1 to value sending one more worker there
+        """
+        harvesters = self.harvesters + extra_harvesters
+        amount = self.amount.copy()
+        collected = np.zeros_like(amount)
+        per_harvester = np.zeros_like(amount)
+        for _ in range(turns):
+            each = np.where(harvesters > 0, np.minimum(self.collection_rate, amount / np.maximum(harvesters, 1)), 0)
+            taken = each * harvesters
+            amount -= taken
+            collected += taken
+            per_harvester += each
+            growing = self.is_wood & (amount > 0) & (amount < PARAMETERS["MAX_WOOD_AMOUNT"])
+            amount[growing] = np.minimum(amount[growing] * PARAMETERS["WOOD_GROWTH_RATE"], PARAMETERS["MAX_WOOD_AMOUNT"])
+        return amount, collected * self.fuel_rate, per_harvester * self.fuel_rate
+
+    def amount_after(self, turns):
+        return self.project(turns)[0]
+
+    def fuel_yield(self, turns, extra_harvesters=0):
+        return self.project(turns, extra_harvesters)[1]
+
+    def harvester_yield(self, turns, extra_harvesters=0):
+        return self.project(turns, extra_harvesters)[2]
+
+    @staticmethod
+    def cluster_total(values, cluster) -> float:
+        """
+        sums a per tile array such as fuel_yield over the tiles of a ResourceCluster
+        """
+        if cluster.is_depleted():
+            return 0.0
+        xs, ys = zip(*cluster.tiles)
+        return float(values[list(ys), list(xs)].sum())
+
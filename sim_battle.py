@@ -2,25 +2,170 @@
 # coding: utf-8
 
 
+import ast
+import hashlib
+import inspect
+import os
+import sqlite3
+
 import numpy as np
+import kaggle_environments
 from kaggle_environments import make
 
-def sim_battle(agent0, agent1, sample_size= 100):
+RESULT_CACHE_PATH = "sim_results.sqlite"
+
+
+def agent_hash(agent):
+    # Hashes the source an agent is built from, so a cached result is reused
+    #  only while neither agent has changed. Agents given as a file or a function
+    #  hash their own file plus the local modules it imports (agent.py behind
+    #  main.py, lux/*), so editing another agent leaves their results cached.
+
+    if callable(agent):
+        path = inspect.getfile(agent)
+        if not os.path.isfile(path):
+            # defined in a notebook, only the function itself is available
+            return hashlib.sha1(inspect.getsource(agent).encode()).hexdigest()
+        # several agents can live in one file
+        return source_files_hash(path, agent.__qualname__)
+    elif os.path.isfile(agent):
+        return source_files_hash(agent)
+    else:
+        # built-in kaggle agents such as "random"
+        return hashlib.sha1(agent.encode()).hexdigest()
+
+
+def source_files_hash(path, name=""):
+    # Hashes the paths and contents of path and the local source files it depends on
+
+    path = os.path.abspath(path)
+    root = os.path.dirname(path)
+    sha = hashlib.sha1(name.encode())
+    for source in local_source_files(path):
+        sha.update(os.path.relpath(source, root).encode())
+        with open(source, "rb") as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def local_source_files(path):
+    # Sorted list of path and every module under its directory it imports, directly or
+    #  through other local modules. Json files next to those modules are included as
+    #  they hold data read at import time, such as lux/game_constants.json
+
+    root = os.path.dirname(path)
+    found = set()
+    todo = [path]
+    while todo:
+        module = todo.pop()
+        if module in found:
+            continue
+        found.add(module)
+        todo.extend(_imported_files(module, root))
+
+    data = set()
+    for module in found:
+        directory = os.path.dirname(module)
+        data.update(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json"))
+    return sorted(found | data)
+
+
+def _imported_files(path, root):
+    with open(path) as f:
+        tree = ast.parse(f.read())
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield from _module_files(root, alias.name.split("."))
+        elif isinstance(node, ast.ImportFrom):
+            base = root
+            if node.level > 0:
+                base = os.path.dirname(path)
+                for _ in range(node.level - 1):
+                    base = os.path.dirname(base)
+            parts = node.module.split(".") if node.module else []
+            yield from _module_files(base, parts)
+            # from package import module
+            for alias in node.names:
+                yield from _module_files(base, parts + [alias.name])
+
+
+def _module_files(base, parts):
+    # files of a dotted module and the packages containing it, if they exist under base
+    for i in range(1, len(parts) + 1):
+        stem = os.path.join(base, *parts[:i])
+        for candidate in [stem + ".py", os.path.join(stem, "__init__.py")]:
+            if os.path.isfile(candidate):
+                yield os.path.abspath(candidate)
+
+
+class ResultCache:
+    # On-disk store of game outcomes keyed by (agent0 hash, agent1 hash, seed, engine version)
+
+    def __init__(self, path=RESULT_CACHE_PATH):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "agent0 TEXT, agent1 TEXT, seed INTEGER, engine TEXT, "
+            "a0_score REAL, a1_score REAL, "
+            "PRIMARY KEY (agent0, agent1, seed, engine))"
+        )
+
+    def get(self, agent0, agent1, seeds, engine):
+        # returns {seed: (a0_score, a1_score)} for the seeds already played
+        results = {}
+        for seed in seeds:
+            row = self.conn.execute(
+                "SELECT a0_score, a1_score FROM results WHERE agent0=? AND agent1=? AND seed=? AND engine=?",
+                (agent0, agent1, seed, engine),
+            ).fetchone()
+            if row is not None:
+                results[seed] = row
+        return results
+
+    def put(self, agent0, agent1, seed, engine, a0_score, a1_score):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (agent0, agent1, seed, engine, a0_score, a1_score),
+        )
+        self.conn.commit()
+
+
+def sim_battle(agent0, agent1, sample_size= 100, seeds=None, cache_path=RESULT_CACHE_PATH, annotations=True):
     # Simulates battles between two agents
     #  returns W/ D /L as a dict and win rate
+    #  pass fixed seeds to reuse results cached in cache_path, cache_path=None disables the cache
+    #  annotations=False runs the agents as in competition, with their debug overlay turned off
 
     wins, draw, loss= 0, 0 ,0
 
-    rng= np.random.randint(1, 10**7, size=sample_size)
+    if seeds is None:
+        seeds= np.random.randint(1, 10**7, size=sample_size)
+    seeds= [int(seed) for seed in seeds]
+    sample_size= len(seeds)
+
+    engine= kaggle_environments.__version__
+    a0_hash, a1_hash= agent_hash(agent0), agent_hash(agent1)
+
+    cache= ResultCache(cache_path) if cache_path is not None else None
+    scores= cache.get(a0_hash, a1_hash, seeds, engine) if cache is not None else {}
 
-    for seed in rng:
+    for seed in seeds:
 
-        env = make("lux_ai_2021", configuration={"seed": int(seed), "loglevel": 0, "annotations": True}, debug=True)
-        steps = env.run([agent0, agent1])
+        if seed not in scores:
+            env = make("lux_ai_2021", configuration={"seed": seed, "loglevel": 0, "annotations": annotations}, debug=True)
+            steps = env.run([agent0, agent1])
 
-        # if agent 0 final score > agent 1 add win 
-        a0_score= [env.state[0]['reward'] if env.state[0]['reward'] != None else 0]
-        a1_score= [env.state[1]['reward'] if env.state[1]['reward'] != None else 0]
+            a0_reward= env.state[0]['reward'] if env.state[0]['reward'] != None else 0
+            a1_reward= env.state[1]['reward'] if env.state[1]['reward'] != None else 0
+            scores[seed]= (a0_reward, a1_reward)
+
+            if cache is not None:
+                cache.put(a0_hash, a1_hash, seed, engine, a0_reward, a1_reward)
+
+        # if agent 0 final score > agent 1 add win
+        a0_score, a1_score= scores[seed]
 
         if a0_score > a1_score:
             wins+= 1
@@ -28,7 +173,7 @@ def sim_battle(agent0, agent1, sample_size= 100):
             draw+=1
         else:
             loss+=1
-        
-        win_rate= (wins+ draw*0.5)/sample_size
+
+    win_rate= (wins+ draw*0.5)/sample_size
 
     return {"Wins": wins, "Draws" :draw, "Losses": loss, "Win rate": win_rate}
@@ -0,0 +1,108 @@
+from lux.action_masks import ActionMasks
+from lux.game import Game
+
+MESSAGES = [
+    "0", "12 12", "rp 0 0", "rp 1 0",
+    "r wood 5 5 500",
+    # worker in the corner, full cargo, next to an opponent city and our own city tile
+    "u 0 0 u_1 0 0 0 100 0 0",
+    # worker on our own city tile
+    "u 0 0 u_2 0 1 0 0 0 0",
+    # worker on a wood tile with a road, full cargo, next to another of our workers
+    "u 0 0 u_3 5 5 0 100 0 0",
+    # worker below CITY_BUILD_COST
+    "u 0 0 u_4 6 5 0 50 0 0",
+    # cart on cooldown
+    "u 1 0 u_5 8 8 2 0 0 0",
+    "c 0 c_1 0 23", "c 1 c_2 0 23",
+    "ct 0 c_1 0 1 0", "ct 0 c_1 3 3 5", "ct 1 c_2 1 0 0",
+    "ccd 5 5 1",
+    "D_DONE",
+]
+
+
+def make_masks(messages=MESSAGES):
+    game = Game()
+    game._initialize(messages)
+    game._update(messages[2:])
+    units = {unit.id: unit for unit in game.players[0].units}
+    citytiles = {(ct.pos.x, ct.pos.y): ct for city in game.players[0].cities.values() for ct in city.citytiles}
+    return ActionMasks(game, 0), units, citytiles
+
+
+def test_no_moves_off_the_low_edges():
+    masks, units, _ = make_masks()
+    assert not masks.unit_can(units["u_1"], "n")
+    assert not masks.unit_can(units["u_1"], "w")
+    assert masks.unit_can(units["u_1"], "c")
+
+
+def test_no_moves_into_opponent_city():
+    masks, units, _ = make_masks()
+    assert not masks.unit_can(units["u_1"], "e")
+
+
+def test_units_stack_on_own_city_tile_only():
+    masks, units, _ = make_masks()
+    # (0, 1) is our city tile with u_2 on it
+    assert masks.unit_can(units["u_1"], "s")
+    # (6, 5) has u_4 on it outside any city
+    assert not masks.unit_can(units["u_3"], "e")
+    assert masks.unit_can(units["u_3"], "n")
+
+
+def test_build_city():
+    masks, units, _ = make_masks()
+    assert masks.unit_can(units["u_1"], "bcity")
+    # on a resource tile
+    assert not masks.unit_can(units["u_3"], "bcity")
+    # below CITY_BUILD_COST
+    assert not masks.unit_can(units["u_4"], "bcity")
+    # already a city tile
+    assert not masks.unit_can(units["u_2"], "bcity")
+
+
+def test_pillage_needs_a_road():
+    masks, units, _ = make_masks()
+    assert masks.unit_can(units["u_3"], "p")
+    assert not masks.unit_can(units["u_1"], "p")
+    assert not masks.unit_can(units["u_4"], "p")
+
+
+def test_cooldown_blocks_unit_actions():
+    masks, units, _ = make_masks()
+    assert [masks.unit_can(units["u_5"], action) for action in ["c", "n", "e", "s", "w", "bcity", "p"]] == \
+        [True, False, False, False, False, False, False]
+
+
+def test_citytile_cooldown_and_worker_cap():
+    masks, _, citytiles = make_masks()
+    ready, cooling = citytiles[(0, 1)], citytiles[(3, 3)]
+    assert masks.citytile_can(ready, "r")
+    assert not masks.citytile_can(cooling, "r")
+    # 5 units and 2 city tiles
+    assert not masks.citytile_can(ready, "bw")
+    assert not masks.citytile_can(ready, "bc")
+
+
+def test_citytile_builds_below_worker_cap():
+    messages = [
+        "0", "12 12", "rp 0 0", "rp 1 0",
+        "u 0 0 u_1 0 0 0 0 0 0",
+        "c 0 c_1 0 23", "ct 0 c_1 4 4 0", "ct 0 c_1 4 5 5",
+        "D_DONE",
+    ]
+    masks, _, citytiles = make_masks(messages)
+    assert masks.citytile_can(citytiles[(4, 4)], "bw")
+    assert masks.citytile_can(citytiles[(4, 4)], "bc")
+    assert not masks.citytile_can(citytiles[(4, 5)], "bw")
+
+
+def test_agent_random_free_only_takes_legal_moves():
+    import agent
+
+    masks, units, _ = make_masks()
+    agent.action_masks = masks
+    for _ in range(20):
+        target, action = agent.random_free(units["u_1"], [], None)
+        assert (target.x, target.y, action) == (0, 1, "m u_1 s")
@@ -0,0 +1,33 @@
+from lux import annotate
+
+
+def test_disabled_buffer_drops_everything():
+    buffer = annotate.AnnotationBuffer()
+    buffer.circle(1, 2)
+    buffer.text(1, 1, lambda: 1 / 0)
+    assert buffer.flush() == []
+
+
+def test_level_filters_commands():
+    buffer = annotate.AnnotationBuffer(annotate.DEBUG)
+    buffer.circle(1, 2, level=annotate.DEBUG)
+    buffer.circle(3, 4, level=annotate.TRACE)
+    assert buffer.flush() == ["dc 1 2"]
+
+
+def test_lazy_messages_and_unhashable_arguments():
+    buffer = annotate.AnnotationBuffer(annotate.INFO)
+    buffer.text(1, 1, "{}", [1, 2])
+    buffer.sidetext(lambda: "lazy")
+    assert buffer.flush() == ["dt 1 1 16 '[1, 2]'", "dst 'lazy'"]
+
+
+def test_duplicates_removed_and_capped():
+    buffer = annotate.AnnotationBuffer(annotate.INFO, max_commands=2)
+    buffer.x(1, 1)
+    buffer.x(1, 1)
+    buffer.text(0, 0, "{}", [1])
+    buffer.text(0, 0, "[1]")
+    buffer.line(0, 0, 1, 1)
+    assert buffer.flush() == ["dx 1 1", "dt 0 0 16 '[1]'"]
+    assert buffer.flush() == []
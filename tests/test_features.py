@@ -0,0 +1,88 @@
+import numpy as np
+
+from lux.features import FEATURE_PLANES, MAP_SIZE, PLANE, encode, iter_feature_batches, iter_game_states, replay_updates
+from lux.game import Game
+
+TURN_0 = [
+    "0", "12 12", "rp 0 10", "rp 1 0",
+    "r wood 0 0 500",
+    "u 0 0 u_1 2 2 1 50 0 0", "u 1 1 u_2 9 2 0 0 0 0",
+    "c 0 c_1 230 23", "c 1 c_2 0 23",
+    "ct 0 c_1 2 2 0", "ct 1 c_2 9 2 5",
+    "D_DONE",
+]
+TURN = ["rp 0 10", "rp 1 0", "r wood 0 0 500", "D_DONE"]
+
+# padding offset of a 12x12 map
+OFFSET = (MAP_SIZE - 12) // 2
+
+
+def play(turns):
+    game = Game()
+    game._initialize(TURN_0)
+    game._update(TURN_0[2:])
+    for _ in range(turns):
+        game._update(TURN)
+    return game
+
+
+def plane(features, name):
+    return features[PLANE[name]]
+
+
+def test_shape_and_centered_padding():
+    features = encode(play(0), 0)
+    assert features.shape == (len(FEATURE_PLANES), MAP_SIZE, MAP_SIZE)
+    assert features.dtype == np.float32
+    on_map = plane(features, "on_map")
+    assert on_map.sum() == 144
+    assert on_map[OFFSET:OFFSET + 12, OFFSET:OFFSET + 12].all()
+    assert plane(features, "wood")[OFFSET, OFFSET] == 1
+
+
+def test_own_and_opp_planes_swap_with_team():
+    game = play(0)
+    seen_by_0, seen_by_1 = encode(game, 0), encode(game, 1)
+    worker_0, worker_1 = (OFFSET + 2, OFFSET + 2), (OFFSET + 2, OFFSET + 9)
+    assert plane(seen_by_0, "own_workers")[worker_0] == 1
+    assert plane(seen_by_0, "opp_carts")[worker_1] == 1
+    assert plane(seen_by_1, "own_carts")[worker_1] == 1
+    assert plane(seen_by_1, "opp_workers")[worker_0] == 1
+    assert plane(seen_by_0, "own_cargo")[worker_0] == 0.5
+    assert plane(seen_by_0, "own_unit_cooldown")[worker_0] == 0.5
+    assert plane(seen_by_0, "own_city_fuel")[worker_0] == 1
+    assert plane(seen_by_1, "own_citytile_cooldown")[worker_1] == 0.5
+    assert plane(seen_by_0, "own_research")[0, 0] == plane(seen_by_1, "opp_research")[0, 0] == 10 / 200
+    for name in ["workers", "carts", "cargo", "unit_cooldown", "citytiles", "city_fuel", "citytile_cooldown", "research"]:
+        assert (plane(seen_by_0, "own_" + name) == plane(seen_by_1, "opp_" + name)).all()
+
+
+def test_night_and_day_phase_around_turn_30():
+    day, night = encode(play(29), 0), encode(play(30), 0)
+    assert plane(day, "night").max() == 0
+    assert plane(night, "night").min() == 1
+    assert plane(day, "day_phase")[0, 0] == np.float32(29 / 40)
+    assert plane(night, "day_phase")[0, 0] == np.float32(30 / 40)
+
+
+def test_batches_from_generator_streams():
+    def stream(turns):
+        yield TURN_0
+        for _ in range(turns):
+            yield TURN
+
+    batches = list(iter_feature_batches((stream(turns) for turns in [3, 2]), 0, batch_size=2))
+    assert [batch.shape[0] for batch in batches] == [2, 2, 2, 1]
+    assert all(batch.shape[1:] == (len(FEATURE_PLANES), MAP_SIZE, MAP_SIZE) for batch in batches)
+    turns = [batch[i, PLANE["turn"], 0, 0] * 360 for batch in batches for i in range(batch.shape[0])]
+    assert np.allclose(turns, [0, 1, 2, 3, 0, 1, 2])
+
+
+def test_replay_updates_reads_player_0_observations():
+    replay = {"steps": [
+        [{"observation": {"updates": TURN_0}}, {"observation": {}}],
+        [{"observation": {"updates": TURN}}, {"observation": {}}],
+    ]}
+    assert list(replay_updates(replay)) == [TURN_0, TURN]
+    games = [game.turn for game in iter_game_states(replay_updates(replay))]
+    assert games == [0, 1]
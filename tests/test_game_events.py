@@ -0,0 +1,84 @@
+from lux.constants import Constants
+from lux.game import Game
+
+EVENT_TYPES = Constants.EVENT_TYPES
+
+TURN_0 = [
+    "0", "12 12", "rp 0 45", "rp 1 0",
+    "r wood 0 0 500", "r wood 1 0 400",
+    "u 0 0 u_1 2 2 0 0 0 0", "u 0 0 u_2 5 5 0 0 0 0", "u 0 1 u_3 9 2 0 0 0 0",
+    "c 0 c_1 0 23", "c 0 c_2 0 23", "c 1 c_3 0 23",
+    "ct 0 c_1 2 2 0", "ct 0 c_2 4 2 0", "ct 1 c_3 9 2 0",
+    "ccd 2 2 6", "ccd 4 2 6", "ccd 9 2 6",
+    "D_DONE",
+]
+
+# u_1 moves, u_3 dies, u_4 spawns, c_2 merges into c_1, c_3 goes dark,
+# c_4 is founded, wood at (0, 0) runs out, coal is researched, a road is built
+TURN_1 = [
+    "rp 0 50", "rp 1 0",
+    "r wood 1 0 400",
+    "u 0 0 u_1 3 2 0 0 0 0", "u 0 0 u_2 5 5 0 0 0 0", "u 0 0 u_4 2 2 0 0 0 0",
+    "c 0 c_1 0 23", "c 0 c_4 0 23",
+    "ct 0 c_1 2 2 0", "ct 0 c_1 3 2 0", "ct 0 c_1 4 2 0", "ct 0 c_4 7 7 0",
+    "ccd 2 2 6", "ccd 3 2 6", "ccd 4 2 6", "ccd 7 7 6", "ccd 5 6 0.75",
+    "D_DONE",
+]
+
+
+def play(*turns):
+    game = Game()
+    game._initialize(turns[0])
+    game._update(turns[0][2:])
+    for messages in turns[1:]:
+        game._update(messages)
+    return game
+
+
+def events_of(game, e_type):
+    return [event for event in game.events if event.type == e_type]
+
+
+def test_first_turn_spawns_everything():
+    game = play(TURN_0)
+    assert {e.id for e in events_of(game, EVENT_TYPES.UNIT_SPAWNED)} == {"u_1", "u_2", "u_3"}
+    assert {e.id for e in events_of(game, EVENT_TYPES.CITY_FOUNDED)} == {"c_1", "c_2", "c_3"}
+    assert len(events_of(game, EVENT_TYPES.ROAD_UPGRADED)) == 3
+    assert events_of(game, EVENT_TYPES.UNIT_MOVED) == []
+
+
+def test_unit_events():
+    game = play(TURN_0, TURN_1)
+    [moved] = events_of(game, EVENT_TYPES.UNIT_MOVED)
+    assert (moved.id, moved.team, moved.pos, moved.value) == ("u_1", 0, game.map.get_cell(3, 2).pos, game.map.get_cell(2, 2).pos)
+    [died] = events_of(game, EVENT_TYPES.UNIT_DIED)
+    assert (died.id, died.team) == ("u_3", 1)
+    [spawned] = events_of(game, EVENT_TYPES.UNIT_SPAWNED)
+    assert spawned.id == "u_4"
+
+
+def test_city_events():
+    game = play(TURN_0, TURN_1)
+    [merged] = events_of(game, EVENT_TYPES.CITY_MERGED)
+    assert (merged.id, merged.value) == ("c_2", "c_1")
+    [lost] = events_of(game, EVENT_TYPES.CITY_LOST)
+    assert (lost.id, lost.team) == ("c_3", 1)
+    [founded] = events_of(game, EVENT_TYPES.CITY_FOUNDED)
+    assert founded.id == "c_4"
+    built = {(e.pos.x, e.pos.y) for e in events_of(game, EVENT_TYPES.CITY_TILE_BUILT)}
+    assert built == {(3, 2), (7, 7)}
+
+
+def test_map_and_research_events():
+    game = play(TURN_0, TURN_1)
+    [depleted] = events_of(game, EVENT_TYPES.TILE_DEPLETED)
+    assert ((depleted.pos.x, depleted.pos.y), depleted.value) == ((0, 0), Constants.RESOURCE_TYPES.WOOD)
+    roads = {(e.pos.x, e.pos.y): e.value for e in events_of(game, EVENT_TYPES.ROAD_UPGRADED)}
+    assert roads == {(3, 2): 6, (7, 7): 6, (5, 6): 0.75}
+    [research] = events_of(game, EVENT_TYPES.RESEARCH_THRESHOLD)
+    assert (research.team, research.value) == (0, Constants.RESOURCE_TYPES.COAL)
+
+
+def test_no_events_when_nothing_changes():
+    game = play(TURN_0, TURN_1, TURN_1)
+    assert game.events == []
@@ -0,0 +1,97 @@
+from lux.game import Game
+
+MESSAGES = [
+    "0", "12 12", "rp 0 0", "rp 1 0",
+    "r wood 0 0 500", "r wood 11 0 500",
+    "u 0 0 u_1 2 2 0 0 0 0", "u 0 1 u_2 9 2 0 0 0 0",
+    "c 0 c_1 0 23", "c 1 c_2 0 23",
+    "ct 0 c_1 2 3 3", "ct 0 c_1 3 3 3", "ct 1 c_2 9 3 3",
+    "D_DONE",
+]
+
+
+def make_game():
+    game = Game()
+    game._initialize(MESSAGES)
+    game._update(MESSAGES[2:])
+    return game
+
+
+def test_fork_shares_until_written():
+    game = make_game()
+    fork = game.fork()
+    assert fork.map.get_cell(0, 0) is game.map.get_cell(0, 0)
+    assert fork.players[0].units[0] is game.players[0].units[0]
+
+
+def test_map_cell_write_leaves_parent_unchanged():
+    game = make_game()
+    fork = game.fork()
+    fork.map.get_cell_mut(0, 0).resource.amount = 1
+    fork.map.get_cell_mut(1, 1).road = 6
+    assert game.map.get_cell(0, 0).resource.amount == 500
+    assert game.map.get_cell(1, 1).road == 0
+    assert fork.map.get_cell(0, 0).resource.amount == 1
+
+
+def test_map_citytile_write_leaves_parent_unchanged():
+    game = make_game()
+    fork = game.fork()
+    fork.map.get_cell_mut(2, 3).citytile.cooldown = 9
+    assert game.map.get_cell(2, 3).citytile.cooldown == 3
+    assert game.players[0].cities["c_1"].citytiles[0].cooldown == 3
+
+
+def test_game_cell_write_updates_fork_city_only():
+    game = make_game()
+    fork = game.fork()
+    fork.get_cell_mut(2, 3).citytile.cooldown = 9
+    assert fork.players[0].cities["c_1"].citytiles[0].cooldown == 9
+    assert game.map.get_cell(2, 3).citytile.cooldown == 3
+    assert game.players[0].cities["c_1"].citytiles[0].cooldown == 3
+
+
+def test_city_write_updates_fork_map_only():
+    game = make_game()
+    fork = game.fork()
+    city = fork.get_city_mut(0, "c_1")
+    city.fuel = 100
+    city.citytiles[0].cooldown = 9
+    assert fork.map.get_cell(2, 3).citytile is city.citytiles[0]
+    assert fork.map.get_cell(2, 3).citytile.cooldown == 9
+    assert game.players[0].cities["c_1"].fuel == 0
+    assert game.players[0].cities["c_1"].citytiles[0].cooldown == 3
+    assert game.map.get_cell(2, 3).citytile.cooldown == 3
+
+
+def test_unit_write_leaves_parent_unchanged():
+    game = make_game()
+    fork = game.fork()
+    unit = fork.players[0].get_unit_mut("u_1")
+    unit.pos.x = 5
+    unit.cargo.wood = 40
+    assert game.players[0].units[0].pos.x == 2
+    assert game.players[0].units[0].cargo.wood == 0
+    assert fork.players[0].units[0] is unit
+
+
+def test_parent_write_leaves_fork_unchanged():
+    game = make_game()
+    fork = game.fork()
+    game.get_cell_mut(2, 3).citytile.cooldown = 9
+    game.players[0].get_unit_mut("u_1").cooldown = 2
+    assert fork.map.get_cell(2, 3).citytile.cooldown == 3
+    assert fork.players[0].cities["c_1"].citytiles[0].cooldown == 3
+    assert fork.players[0].units[0].cooldown == 0
+
+
+def test_fork_of_fork_is_isolated():
+    game = make_game()
+    fork = game.fork()
+    fork.get_cell_mut(0, 0).resource.amount = 7
+    child = fork.fork()
+    fork.get_cell_mut(0, 0).resource.amount = 1
+    fork.get_city_mut(0, "c_1").citytiles[1].cooldown = 9
+    assert child.map.get_cell(0, 0).resource.amount == 7
+    assert child.map.get_cell(3, 3).citytile.cooldown == 3
+    assert game.map.get_cell(0, 0).resource.amount == 500
@@ -0,0 +1,68 @@
+from lux.game import Game
+from lux.game_map import Position
+from lux.resource_clusters import ResourceClusters
+
+# two wood clusters far from the city at (1, 1), plus one next to it
+MESSAGES = [
+    "0", "16 16", "rp 0 0", "rp 1 0",
+    "r wood 2 1 100",
+    "r wood 2 11 300", "r wood 3 11 300",
+    "r wood 11 2 300",
+    "u 0 0 u_1 1 1 0 0 0 0",
+    "c 0 c_1 0 23", "ct 0 c_1 1 1 0",
+    "D_DONE",
+]
+
+
+def make_clusters():
+    game = Game()
+    game._initialize(MESSAGES)
+    game._update(MESSAGES[2:])
+    return game, ResourceClusters(game)
+
+
+def test_clusters_found():
+    game, clusters = make_clusters()
+    tiles = sorted(sorted(cluster.tiles) for cluster in clusters.clusters)
+    assert tiles == [[(2, 1)], [(2, 11), (3, 11)], [(11, 2)]]
+    assert clusters.cluster_at(Position(3, 11)).fuel == 600
+
+
+def test_claims_spread_workers_in_one_turn():
+    game, clusters = make_clusters()
+    player = game.players[0]
+    home = Position(1, 1)
+    targets = []
+    for _ in range(3):
+        cluster = clusters.expansion_target(home, player, min_dist=8)
+        targets.append((cluster, clusters.claim(cluster, home, player.team)))
+    picked = [(tile.x, tile.y) for cluster, tile in targets]
+    assert len(set(picked)) == 3
+    assert {cluster for cluster, tile in targets[:2]} == {clusters.cluster_at(Position(2, 11)), clusters.cluster_at(Position(11, 2))}
+
+
+def test_claims_reset_next_turn():
+    game, clusters = make_clusters()
+    cluster = clusters.cluster_at(Position(11, 2))
+    clusters.claim(cluster, Position(1, 1), 0)
+    assert cluster.units[0] == 1
+    game._update(MESSAGES[2:])
+    clusters.update(game)
+    assert cluster.units[0] == 0
+    assert clusters.claim(cluster, Position(1, 1), 0) == Position(11, 2)
+
+
+def test_depleted_tile_becomes_build_site_of_neighbouring_cluster():
+    messages = ["0", "12 12", "rp 0 50", "rp 1 50", "r wood 5 5 100", "r coal 6 5 300", "D_DONE"]
+    game = Game()
+    game._initialize(messages)
+    game._update(messages[2:])
+    clusters = ResourceClusters(game)
+    coal = clusters.cluster_at(Position(6, 5))
+    assert (5, 5) not in coal.build_sites
+
+    game._update(["rp 0 50", "rp 1 50", "r coal 6 5 300", "D_DONE"])
+    clusters.update(game)
+    assert clusters.cluster_at(Position(5, 5)) is None
+    assert (5, 5) in coal.build_sites
+    assert coal in clusters._clusters_of_site[(5, 5)]
@@ -0,0 +1,43 @@
+from lux.game import Game
+from lux.game_map import Position
+from lux.resource_forecast import ResourceForecast
+
+MESSAGES = [
+    "0", "12 12", "rp 0 0", "rp 1 0",
+    "r wood 1 0 100", "r wood 10 0 500", "r coal 5 5 300",
+    "u 0 0 u_1 0 0 0 0 0 0",
+    "D_DONE",
+]
+
+
+def make_forecast(harvesters):
+    game = Game()
+    game._initialize(MESSAGES)
+    game._update(MESSAGES[2:])
+    return ResourceForecast(game.map, harvesters, game.players[0])
+
+
+def test_untouched_wood_regrows_up_to_max():
+    forecast = make_forecast([])
+    amount = forecast.amount_after(100)
+    assert amount[0, 10] == 500
+    assert 100 < amount[0, 1] <= 500
+
+
+def test_harvesters_deplete_their_tile():
+    forecast = make_forecast([Position(0, 0)])
+    amount, collected, per_harvester = forecast.project(10)
+    assert amount[0, 1] == 0
+    assert collected[0, 1] == per_harvester[0, 1] > 100
+
+
+def test_joining_harvester_splits_the_tile():
+    forecast = make_forecast([Position(0, 0)])
+    alone = forecast.harvester_yield(10)[0, 1]
+    shared = forecast.harvester_yield(10, extra_harvesters=1)[0, 1]
+    assert shared < alone
+
+
+def test_unresearched_coal_yields_nothing():
+    forecast = make_forecast([Position(5, 4)])
+    assert forecast.fuel_yield(10)[5, 5] == 0
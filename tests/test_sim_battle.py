@@ -0,0 +1,86 @@
+import linecache
+import sys
+import types
+
+import pytest
+
+# sim_battle only needs kaggle_environments to play games, which these tests never do
+sys.modules.setdefault("kaggle_environments", types.SimpleNamespace(make=None, __version__="test"))
+
+from sim_battle import ResultCache, agent_hash, local_source_files
+
+
+@pytest.fixture
+def agents(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "mod.py").write_text("from .other import helper\n")
+    (tmp_path / "pkg" / "other.py").write_text("def helper():\n    return 1\n")
+    (tmp_path / "pkg" / "data.json").write_text("{}")
+    (tmp_path / "agent.py").write_text("from pkg import mod\n\ndef agent(obs, conf):\n    return []\n")
+    (tmp_path / "baseline.py").write_text("import pkg.other\n\ndef agent(obs, conf):\n    return []\n")
+    (tmp_path / "main.py").write_text("from agent import agent\n")
+    (tmp_path / "unrelated.py").write_text("x = 1\n")
+    return tmp_path
+
+
+def test_local_source_files_follow_imports(agents):
+    files = [path[len(str(agents)) + 1:] for path in local_source_files(str(agents / "main.py"))]
+    assert files == ["agent.py", "main.py", "pkg/__init__.py", "pkg/data.json", "pkg/mod.py", "pkg/other.py"]
+
+
+def test_agents_in_one_directory_hash_differently(agents):
+    assert agent_hash(str(agents / "agent.py")) != agent_hash(str(agents / "baseline.py"))
+
+
+def test_hash_changes_with_imported_modules_only(agents):
+    main, baseline = agent_hash(str(agents / "main.py")), agent_hash(str(agents / "baseline.py"))
+    (agents / "unrelated.py").write_text("x = 2\n")
+    (agents / "agent.py").write_text("from pkg import mod\n\ndef agent(obs, conf):\n    return ['r 0 0']\n")
+    assert agent_hash(str(agents / "main.py")) != main
+    assert agent_hash(str(agents / "baseline.py")) == baseline
+    (agents / "pkg" / "other.py").write_text("def helper():\n    return 2\n")
+    assert agent_hash(str(agents / "baseline.py")) != baseline
+
+
+def test_function_agents_hash_their_file_and_name(agents):
+    sys.path.insert(0, str(agents))
+    try:
+        import baseline
+    finally:
+        sys.path.remove(str(agents))
+
+    def other_agent(obs, conf):
+        return []
+
+    assert agent_hash(baseline.agent) == agent_hash(baseline.agent)
+    assert agent_hash(baseline.agent) != agent_hash(other_agent)
+
+
+def notebook_function(cell, source):
+    # what IPython does for a function defined in a notebook cell
+    filename = f"<ipython-input-{cell}>"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    namespace = {}
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["agent"]
+
+
+def test_notebook_agents_hash_their_source():
+    first = notebook_function(1, "def agent(obs, conf):\n    return []\n")
+    second = notebook_function(2, "def agent(obs, conf):\n    return ['r 0 0']\n")
+    assert agent_hash(first) != agent_hash(second)
+
+
+def test_builtin_agents_hash_their_name():
+    assert agent_hash("random") != agent_hash("simple_agent")
+
+
+def test_result_cache_round_trip(tmp_path):
+    cache = ResultCache(str(tmp_path / "results.sqlite"))
+    cache.put("a", "b", 1, "v1", 10, 20)
+    cache.put("a", "b", 2, "v1", 30, 0)
+    assert cache.get("a", "b", [1, 2, 3], "v1") == {1: (10, 20), 2: (30, 0)}
+    assert cache.get("b", "a", [1], "v1") == {}
+    assert cache.get("a", "b", [1], "v2") == {}
+    assert ResultCache(str(tmp_path / "results.sqlite")).get("a", "b", [1], "v1") == {1: (10, 20)}
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from lux.game import Game
+from lux.game_map import Position
+from lux.resource_clusters import ResourceClusters
+
+
+def mirrored_game(axis, size, seed):
+    rng = random.Random(seed)
+    cells = {}
+    for _ in range(rng.randint(1, 40)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        r_type, amount = rng.choice(["wood", "coal", "uranium"]), rng.choice([300, 400])
+        mirror = (size - 1 - x, y) if axis == "x" else (x, size - 1 - y)
+        cells[(x, y)] = cells[mirror] = (r_type, amount)
+    messages = ["0", f"{size} {size}", "rp 0 0", "rp 1 0"]
+    messages += [f"r {r_type} {x} {y} {amount}" for (x, y), (r_type, amount) in cells.items()]
+    # starting cities on opposite sides of the axis, unless a resource is there
+    city = (1, 1)
+    mirror = (size - 2, 1) if axis == "x" else (1, size - 2)
+    if city not in cells and mirror not in cells:
+        messages += ["c 0 c_1 0 23", "c 1 c_2 0 23", f"ct 0 c_1 {city[0]} {city[1]} 0", f"ct 1 c_2 {mirror[0]} {mirror[1]} 0"]
+    messages.append("D_DONE")
+    game = Game()
+    game._initialize(messages)
+    game._update(messages[2:])
+    return game
+
+
+def test_find_symmetry():
+    assert mirrored_game("x", 12, 0).symmetry == "x"
+    assert mirrored_game("y", 12, 0).symmetry == "y"
+    messages = ["0", "12 12", "rp 0 0", "rp 1 0", "r wood 0 0 300", "r wood 11 11 300", "D_DONE"]
+    game = Game()
+    game._initialize(messages)
+    game._update(messages[2:])
+    assert game.symmetry is None
+    assert game.map.find_symmetry() is None
+
+
+def test_find_symmetry_checks_amounts_and_city_tiles():
+    messages = ["0", "12 12", "rp 0 0", "rp 1 0", "r wood 0 0 300", "r wood 11 0 400", "D_DONE"]
+    game = Game()
+    game._initialize(messages)
+    game._update(messages[2:])
+    assert game.symmetry is None
+    messages = ["0", "12 12", "rp 0 0", "rp 1 0", "c 0 c_1 0 23", "ct 0 c_1 1 1 0", "D_DONE"]
+    game = Game()
+    game._initialize(messages)
+    game._update(messages[2:])
+    assert game.symmetry is None
+
+
+def test_symmetry_kept_on_later_turns():
+    game = mirrored_game("x", 12, 1)
+    game._update(["rp 0 0", "rp 1 0", "D_DONE"])
+    assert game.map.symmetry == "x"
+
+
+def test_mirror():
+    game = mirrored_game("x", 12, 0)
+    assert game.map.mirror(Position(2, 3)) == Position(9, 3)
+    assert game.map.mirror(Position(2, 3), "y") == Position(2, 8)
+    game.map.symmetry = None
+    assert game.map.mirror(Position(2, 3)) is None
+
+
+@pytest.mark.parametrize("axis", ["x", "y"])
+@pytest.mark.parametrize("size", [12, 13, 16])
+def test_half_map_clusters_match_full_scan(axis, size):
+    for seed in range(30):
+        game = mirrored_game(axis, size, seed)
+        if game.symmetry != axis:
+            # also mirrored along the other axis by chance
+            continue
+        half = ResourceClusters(game)
+        game.map.symmetry = None
+        full = ResourceClusters(game)
+
+        def summary(clusters):
+            return sorted((sorted(c.tiles), c.type, c.fuel, sorted(c.build_sites), c.citytiles) for c in clusters.clusters)
+
+        assert summary(half) == summary(full)
+        for cluster in half.clusters:
+            mirrored = {(game.map.width - 1 - x, y) if axis == "x" else (x, game.map.height - 1 - y) for x, y in cluster.tiles}
+            assert cluster.mirror.tiles == mirrored